@@ -94,16 +94,28 @@ def getWhiteKingEgPst():
 # -------------------- Black helpers --------------------
 
 def flipPst(pst: np.ndarray) -> np.ndarray:
-    """Return the black piece-square table by flipping the white one (rank+file mirror)."""
-    return np.flip(pst)
-
-def getBlackPawnPst():   return flipPst(getWhitePawnPst())
-def getBlackKnightPst(): return flipPst(getWhiteKnightPst())
-def getBlackBishopPst(): return flipPst(getWhiteBishopPst())
-def getBlackRookPst():   return flipPst(getWhiteRookPst())
-def getBlackQueenPst():  return flipPst(getWhiteQueenPst())
-def getBlackKingMgPst(): return flipPst(getWhiteKingMgPst())
-def getBlackKingEgPst(): return flipPst(getWhiteKingEgPst())
+    """
+    Return the black piece-square table by flipping the white one (rank+file mirror).
+    The result is a contiguous copy rather than a negative-stride view of the white table.
+    """
+    return np.ascontiguousarray(pst[::-1])
+
+# Built once at import; the getters hand out these constants instead of rebuilding and flipping
+BLACK_PAWN_PST    = flipPst(getWhitePawnPst())
+BLACK_KNIGHT_PST  = flipPst(getWhiteKnightPst())
+BLACK_BISHOP_PST  = flipPst(getWhiteBishopPst())
+BLACK_ROOK_PST    = flipPst(getWhiteRookPst())
+BLACK_QUEEN_PST   = flipPst(getWhiteQueenPst())
+BLACK_KING_MG_PST = flipPst(getWhiteKingMgPst())
+BLACK_KING_EG_PST = flipPst(getWhiteKingEgPst())
+
+def getBlackPawnPst():   return BLACK_PAWN_PST
+def getBlackKnightPst(): return BLACK_KNIGHT_PST
+def getBlackBishopPst(): return BLACK_BISHOP_PST
+def getBlackRookPst():   return BLACK_ROOK_PST
+def getBlackQueenPst():  return BLACK_QUEEN_PST
+def getBlackKingMgPst(): return BLACK_KING_MG_PST
+def getBlackKingEgPst(): return BLACK_KING_EG_PST
 
 # Back-compat old names (map to MG by default, in case other code still imports them)
 def getWhiteKingPst(): return getWhiteKingMgPst()
@@ -130,6 +142,56 @@ EG_PST = {
     chess.KING:   getWhiteKingEgPst(),   # EG king
 }
 
+# -------------------- Packed MG / EG table --------------------
+# One int32 per square holding mg * 65536 + eg, so a tapered eval fetches both phases
+# with a single lookup and sums them in one pass. All twelve pieces live in one
+# (12, 64) table indexed by pieceIndex(color, piece_type): black rows are pre-mirrored
+# with chess.square_mirror and negated, so summing every piece gives white - black.
+
+_MIRROR = np.array([chess.square_mirror(sq) for sq in chess.SQUARES])
+
+def packPst(mg: np.ndarray, eg: np.ndarray) -> np.ndarray:
+    """Pack an MG and an EG table into one int32 table of mg * 65536 + eg."""
+    return mg.astype(np.int32) * 65536 + eg.astype(np.int32)
+
+def unpackScore(score: int) -> tuple[int, int]:
+    """Split a packed score (or a sum of packed scores) back into (mg, eg)."""
+    mg = (score + 0x8000) >> 16
+    return mg, score - mg * 65536
+
+def pieceIndex(color: chess.Color, piece_type: chess.PieceType) -> int:
+    """Row of a piece in PACKED_PST: black pawn..king are 0..5, white pawn..king are 6..11."""
+    return color * 6 + piece_type - 1
+
+PACKED_PST = np.stack(
+    [-packPst(MG_PST[pt], EG_PST[pt])[_MIRROR] for pt in chess.PIECE_TYPES] +
+    [packPst(MG_PST[pt], EG_PST[pt]) for pt in chess.PIECE_TYPES]
+)
+
+# -------------------- Material and game phase --------------------
+
+# Base material in centipawns (can be tuned).
+MATERIAL = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,  # handled by checkmate; PSTs carry king activity
+}
+
+# Game-phase weights (standard total = 24)
+PHASE_WEIGHT = {
+    chess.PAWN: 0,
+    chess.KNIGHT: 1,
+    chess.BISHOP: 1,
+    chess.ROOK: 2,
+    chess.QUEEN: 4,
+    chess.KING: 0,
+}
+
 # (Optional) sanity checks
 assert all(len(v) == 64 for v in MG_PST.values()), "MG_PST arrays must be length 64"
 assert all(len(v) == 64 for v in EG_PST.values()), "EG_PST arrays must be length 64"
+assert all(v.flags.c_contiguous for v in (*MG_PST.values(), *EG_PST.values())), "PSTs must be C-contiguous"
+assert PACKED_PST.shape == (12, 64), "PACKED_PST must be (12, 64)"
@@ -0,0 +1,261 @@
+import chess
+import chess.polyglot
+from typing import Dict, List, Optional
+
+from PieceSquareTable import MATERIAL, PACKED_PST, PHASE_WEIGHT  # PACKED_PST: (12, 64) packed MG/EG, signed white - black
+
+# Polyglot random numbers: 12 * 64 piece keys, 4 castling keys, 8 en passant keys, 1 turn key
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_TURN_KEY = _RANDOM[780]
+_HASHER = chess.polyglot.ZobristHasher(_RANDOM)
+
+
+def _piece_key(piece_type: chess.PieceType, color: chess.Color, square: chess.Square) -> int:
+    """Polyglot key for a piece on a square (black pieces come first in each pair)."""
+    return _RANDOM[64 * ((piece_type - 1) * 2 + color) + square]
+
+
+# Plain-list copy of PACKED_PST for the hot path: a list index is much cheaper than a numpy scalar read
+_PSQ = PACKED_PST.tolist()
+
+
+def pst_score(board: chess.Board) -> int:
+    """Packed (mg * 65536 + eg) piece-square table sum for both sides (white - black)."""
+    total = 0
+    pieces = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+    for color in chess.COLORS:
+        occupied = board.occupied_co[color]
+        for i, mask in enumerate(pieces):
+            # Row color * 6 + pt - 1: black rows are mirrored and negated, so no branching on color
+            pst = _PSQ[color * 6 + i]
+            bb = mask & occupied
+            # Pop squares straight off the bitboard instead of building a SquareSet
+            while bb:
+                lsb = bb & -bb
+                total += pst[lsb.bit_length() - 1]
+                bb ^= lsb
+    return total
+
+
+# Packed (mg * 65536 + eg) material by [color][piece_type], signed white - black like PACKED_PST
+_MATERIAL = [[0] + [-MATERIAL[pt] * 65537 for pt in chess.PIECE_TYPES],
+             [0] + [MATERIAL[pt] * 65537 for pt in chess.PIECE_TYPES]]
+_PHASE = [0] + [PHASE_WEIGHT[pt] for pt in chess.PIECE_TYPES]
+
+
+def material_score(board: chess.Board) -> int:
+    """Packed material sum for both sides (white - black)."""
+    total = 0
+    for piece_type, bb in enumerate((board.pawns, board.knights, board.bishops,
+                                     board.rooks, board.queens), chess.PAWN):
+        total += _MATERIAL[chess.WHITE][piece_type] * (bb & board.occupied_co[chess.WHITE]).bit_count()
+        total += _MATERIAL[chess.BLACK][piece_type] * (bb & board.occupied_co[chess.BLACK]).bit_count()
+    return total
+
+
+def game_phase(board: chess.Board) -> int:
+    """Sum of PHASE_WEIGHT over all pieces on the board (not clamped)."""
+    return (_PHASE[chess.KNIGHT] * board.knights.bit_count() + _PHASE[chess.BISHOP] * board.bishops.bit_count() +
+            _PHASE[chess.ROOK] * board.rooks.bit_count() + _PHASE[chess.QUEEN] * board.queens.bit_count())
+
+
+def _piece_types(board: chess.Board) -> List[int]:
+    """Piece type on each square (0 for empty), read off the piece bitboards."""
+    piece_types = [0] * 64
+    for piece_type, bb in enumerate((board.pawns, board.knights, board.bishops,
+                                     board.rooks, board.queens, board.kings), chess.PAWN):
+        while bb:
+            lsb = bb & -bb
+            piece_types[lsb.bit_length() - 1] = piece_type
+            bb ^= lsb
+    return piece_types
+
+
+class SearchBoard(chess.Board):
+    """
+    chess.Board that keeps a Polyglot Zobrist hash of the position up to date.
+
+    The hash is XOR-updated on push() and restored from a stack on pop(), so the
+    search gets an int key per node without serializing the board. It always equals
+    chess.polyglot.zobrist_hash(board). Only push/pop maintain the key: set up
+    positions through the constructor or from_board(), not set_fen()/set_piece_at().
+
+    piece_types is maintained the same way: a 64-entry list of the piece type on each
+    square (0 for empty), so search helpers can look squares up without
+    piece_type_at() scanning the piece bitboards. Treat it as read-only; push()
+    replaces it with an updated copy.
+
+    psq is the packed piece-square score, always equal to pst_score(board): a move
+    only subtracts the entries for the squares it empties and adds the one it fills,
+    so evaluate() does not rescan the pieces at every leaf. material (packed like psq)
+    and phase (the unclamped game-phase weight sum) only change on captures and
+    promotions and are kept up to date the same way.
+
+    Every key on the stack is also counted in a dict, bumped on push() and dropped on
+    pop(), so repetition checks are a single lookup. Counting the whole stack rather than
+    only the reversible tail is exact: a capture, pawn move or castling-rights change
+    alters the key for good, so no earlier position can come back.
+    """
+
+    def __init__(self, fen: Optional[str] = chess.STARTING_FEN, *, chess960: bool = False) -> None:
+        super().__init__(fen, chess960=chess960)
+        # push() cleans castling rights before moving; keep them clean so the castling key stays in sync
+        self.castling_rights = self.clean_castling_rights()
+        self._zobrist_stack: List[int] = []
+        self.zobrist = chess.polyglot.zobrist_hash(self)
+        self._key_counts: Dict[int, int] = {self.zobrist: 1}
+        self._piece_types_stack: List[List[int]] = []
+        self.piece_types = _piece_types(self)
+        self._psq_stack: List[int] = []
+        self.psq = pst_score(self)
+        self._material_stack: List[int] = []
+        self.material = material_score(self)
+        self._phase_stack: List[int] = []
+        self.phase = game_phase(self)
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> "SearchBoard":
+        """Build a SearchBoard from any board, replaying its move stack so repetition detection still works."""
+        search_board = cls(board.root().fen(), chess960=board.chess960)
+        for move in board.move_stack:
+            search_board.push(move)
+        return search_board
+
+    def push(self, move: chess.Move) -> None:
+        key = self.zobrist ^ _TURN_KEY
+        if self.ep_square is not None:
+            key ^= _HASHER.hash_ep_square(self)
+
+        castling_key = None
+        piece_types = self.piece_types
+        self._piece_types_stack.append(piece_types)
+        psq = self.psq
+        self._psq_stack.append(psq)
+        material = self.material
+        self._material_stack.append(material)
+        phase = self.phase
+        self._phase_stack.append(phase)
+        if move:
+            from_sq = move.from_square
+            to_sq = move.to_square
+            turn = self.turn
+            piece_type = piece_types[from_sq]
+
+            if piece_type == chess.KING and (abs(to_sq - from_sq) == 2 or self.occupied_co[turn] & chess.BB_SQUARES[to_sq]):
+                # Castling: python-chess decides where king and rook land, so just rehash afterwards
+                super().push(move)
+                self._zobrist_stack.append(self.zobrist)
+                key = self.zobrist = chess.polyglot.zobrist_hash(self)
+                self._key_counts[key] = self._key_counts.get(key, 0) + 1
+                self.piece_types = _piece_types(self)
+                self.psq = pst_score(self)
+                return
+
+            castling = self.castling_rights
+            if castling and (piece_type == chess.KING or castling & (chess.BB_SQUARES[from_sq] | chess.BB_SQUARES[to_sq])):
+                castling_key = _HASHER.hash_castling(self)
+                key ^= castling_key
+
+            piece_types = piece_types.copy()
+            placed = move.promotion or piece_type
+            key ^= _piece_key(piece_type, turn, from_sq)
+            # PACKED_PST rows are color * 6 + piece_type - 1
+            psq += _PSQ[turn * 6 + placed - 1][to_sq] - _PSQ[turn * 6 + piece_type - 1][from_sq]
+            if move.promotion:
+                material += _MATERIAL[turn][placed] - _MATERIAL[turn][chess.PAWN]
+                phase += _PHASE[placed]
+            captured = piece_types[to_sq]
+            if captured:
+                key ^= _piece_key(captured, not turn, to_sq)
+                psq -= _PSQ[(not turn) * 6 + captured - 1][to_sq]
+                material -= _MATERIAL[not turn][captured]
+                phase -= _PHASE[captured]
+            elif piece_type == chess.PAWN and to_sq == self.ep_square:
+                ep_victim = to_sq - 8 if turn == chess.WHITE else to_sq + 8
+                key ^= _piece_key(chess.PAWN, not turn, ep_victim)
+                psq -= _PSQ[(not turn) * 6][ep_victim]
+                material -= _MATERIAL[not turn][chess.PAWN]
+                piece_types[ep_victim] = 0
+            key ^= _piece_key(placed, turn, to_sq)
+            piece_types[from_sq] = 0
+            piece_types[to_sq] = placed
+
+        super().push(move)
+
+        if castling_key is not None:
+            key ^= _HASHER.hash_castling(self)
+        if self.ep_square is not None:
+            key ^= _HASHER.hash_ep_square(self)
+        self._zobrist_stack.append(self.zobrist)
+        self.zobrist = key
+        self._key_counts[key] = self._key_counts.get(key, 0) + 1
+        self.piece_types = piece_types
+        self.psq = psq
+        self.material = material
+        self.phase = phase
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        self._key_counts[self.zobrist] -= 1
+        self.zobrist = self._zobrist_stack.pop()
+        self.piece_types = self._piece_types_stack.pop()
+        self.psq = self._psq_stack.pop()
+        self.material = self._material_stack.pop()
+        self.phase = self._phase_stack.pop()
+        return move
+
+    def is_repetition(self, count: int = 3) -> bool:
+        """Same as chess.Board.is_repetition(), but looks the key up instead of popping moves."""
+        return self._key_counts[self.zobrist] >= count
+
+    def can_claim_threefold_repetition(self) -> bool:
+        """
+        Same rule as chess.Board.can_claim_threefold_repetition(), but counts Zobrist keys
+        instead of popping and re-pushing the game history and every legal move.
+        """
+        key = self.zobrist
+        counts = self._key_counts
+        if counts[key] >= 3:
+            return True
+
+        # A reversible move never sets an en passant square or changes castling rights,
+        # so the key after it only differs by the moved piece and the side to move.
+        key ^= _TURN_KEY
+        if self.ep_square is not None:
+            key ^= _HASHER.hash_ep_square(self)
+        turn = self.turn
+        for move in self.generate_legal_moves():
+            if self.is_irreversible(move):
+                continue
+            piece_type = self.piece_types[move.from_square]
+            child = key ^ _piece_key(piece_type, turn, move.from_square) ^ _piece_key(piece_type, turn, move.to_square)
+            if counts.get(child, 0) >= 2:
+                return True
+        return False
+
+    def copy(self, *, stack: bool | int = True) -> "SearchBoard":
+        board = super().copy(stack=stack)
+        board.zobrist = self.zobrist
+        board._zobrist_stack = self._zobrist_stack[len(self._zobrist_stack) - len(board.move_stack):]
+        board._key_counts = {}
+        for key in (*board._zobrist_stack, board.zobrist):
+            board._key_counts[key] = board._key_counts.get(key, 0) + 1
+        board.piece_types = self.piece_types
+        board._piece_types_stack = self._piece_types_stack[len(self._piece_types_stack) - len(board.move_stack):]
+        board.psq = self.psq
+        board._psq_stack = self._psq_stack[len(self._psq_stack) - len(board.move_stack):]
+        board.material = self.material
+        board._material_stack = self._material_stack[len(self._material_stack) - len(board.move_stack):]
+        board.phase = self.phase
+        board._phase_stack = self._phase_stack[len(self._phase_stack) - len(board.move_stack):]
+        return board
+
+    def root(self) -> "SearchBoard":
+        board = super().root()
+        board.zobrist = chess.polyglot.zobrist_hash(board)
+        board._key_counts = {board.zobrist: 1}
+        board.piece_types = _piece_types(board)
+        board.psq = pst_score(board)
+        board.material = material_score(board)
+        board.phase = game_phase(board)
+        return board
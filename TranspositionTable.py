@@ -1,22 +1,93 @@
 import chess
+import chess.polyglot
+from typing import Optional, Tuple
+from SearchBoard import SearchBoard
 class TranspositionTable:
-    """Simple transposition table wrapper around a Python dict."""
+    """Simple transposition table wrapper around a Python dict keyed by Zobrist hash."""
 
-    def __init__(self):
-        self.hashTable = {}
+    def __init__(self) -> None:
+        self.hashTable: dict[int, int] = {}
 
-    def _key(self, position: chess.Board):
+    def key(self, position: chess.Board) -> int:
         """Return a unique and hashable key for the position."""
-        return position.fen()
+        if isinstance(position, SearchBoard):
+            return position.zobrist
+        return chess.polyglot.zobrist_hash(position)
 
-    def storePosition(self, position: chess.Board, eval: int):
-        key = self._key(position)
+    def probe(self, key: int) -> Optional[int]:
+        """Stored eval for a key from key(), or None; one dict lookup instead of exists() + lookup()."""
+        return self.hashTable.get(key)
+
+    def storePosition(self, position: chess.Board, eval: int, key: Optional[int] = None) -> None:
+        """Store an eval; pass the key from key() to skip hashing the position again."""
+        if key is None:
+            key = self.key(position)
         self.hashTable[key] = eval
 
-    def lookup(self, position: chess.Board):
-        key = self._key(position)
-        return self.hashTable.get(key)
+    def lookup(self, position: chess.Board) -> Optional[int]:
+        return self.probe(self.key(position))
 
     def exists(self, position: chess.Board) -> bool:
-        key = self._key(position)
-        return key in self.hashTable
+        return self.key(position) in self.hashTable
+
+
+def encode_move(move: Optional[chess.Move]) -> int:
+    """Pack a move into 15 bits as from | to << 6 | promotion << 12 (0 means no move)."""
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int) -> Optional[chess.Move]:
+    if code == 0:
+        return None
+    return chess.Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+
+class SearchTable:
+    """
+    Fixed-size transposition table for the alpha-beta search (Stockfish-style).
+
+    Slots live in two preallocated, power-of-two sized lists indexed by key & mask:
+    the Zobrist key, and one int packing score | age | move | depth | flag. Memory stays
+    bounded, there is no dict resizing, and a store allocates no entry object.
+
+    The table can be kept across searches: call new_search() before each one to bump
+    the 6-bit age stamped on new entries. Replacement is depth-preferred among entries
+    from the current or previous search; anything older is overwritten freely.
+    """
+
+    AGE_MASK = 63
+
+    def __init__(self, bits: int = 20) -> None:
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.keys = [0] * self.size
+        self.data = [0] * self.size
+        self.age = 0
+
+    def new_search(self) -> None:
+        """Start a new search: entries stored from now on outrank the ones already in the table."""
+        self.age = (self.age + 1) & self.AGE_MASK
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Return (depth, flag, score, move code) stored for the key, or None.
+        The move stays encoded so a probe that cuts off never builds a chess.Move;
+        call decode_move() when it is needed for ordering.
+        """
+        idx = key & self.mask
+        if self.keys[idx] != key:
+            return None
+        entry = self.data[idx]
+        return (entry >> 2) & 0xFF, entry & 3, entry >> 31, (entry >> 10) & 0x7FFF
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: Optional[chess.Move]) -> None:
+        idx = key & self.mask
+        stored = self.data[idx]
+        # Keep a deeper entry (for this position or another one) unless it is two or more searches old
+        if (stored >> 2) & 0xFF > depth and (self.keys[idx] == key or
+                                              (self.age - (stored >> 25)) & self.AGE_MASK < 2):
+            return
+        self.keys[idx] = key
+        self.data[idx] = (score << 31) | (self.age << 25) | (encode_move(move) << 10) | ((depth & 0xFF) << 2) | flag
@@ -1,15 +1,34 @@
 # alphabeta.py
+import multiprocessing
+import operator
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import chess
-from typing import Optional, Dict, Tuple
-from dataclasses import dataclass
+from typing import Iterable, Optional
 
 from evaluation import evaluate
-from TranspositionTable import TranspositionTable
+from TranspositionTable import TranspositionTable, SearchTable, decode_move
+from SearchBoard import SearchBoard
 
 # Constants
 INF = 10 ** 12
 MATE_SCORE = 900_000
 MAX_PLY = 100
+# Scores beyond this are mates; the TT stores them relative to the node, not the root
+MATE_BOUND = MATE_SCORE - 2 * MAX_PLY
+
+# Set from another thread to stop the search running in this process: the next node raises
+# SearchAbortedError. Only the ponder thread in iterativeDeepening is ever stopped this way.
+search_stop = threading.Event()
+
+class SearchAbortedError(Exception):
+    """Raised out of negamax() once search_stop is set."""
+
+# Killer slots [ply][0..1], history [color][from_square][to_square]; see _new_killers() and _new_history()
+Killers = list[list[Optional[chess.Move]]]
+History = list[list[list[int]]]
+# (ordering score, move, is capture, gives a direct check), as produced by _score_moves()
+ScoredMove = tuple[int, chess.Move, bool, bool]
 
 # Transposition table flags
 TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
@@ -17,11 +36,15 @@ TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
 # Draw contempt (nudge away from easy repetition/50-move draws)
 CONTEMPT = 20  # centipawns
 
-# Move ordering scores
-SCORE_TT_MOVE = 20_000_000
+# Move ordering scores (the TT move outranks even a capturing queen promotion)
+SCORE_TT_MOVE = 100_000_000
 SCORE_PROMOTION_BASE = 8_000_000
 SCORE_CAPTURE_BASE = 6_000_000
+SCORE_KILLER_1 = 4_000_000
+SCORE_KILLER_2 = 3_000_000
 SCORE_CHECK = 5_000
+# History bonuses are capped so a quiet move never outranks a killer
+HISTORY_MAX = SCORE_KILLER_2 - SCORE_CHECK - 1
 
 # Piece values for MVV-LVA (Most Valuable Victim - Least Valuable Attacker)
 _PV = {
@@ -33,100 +56,253 @@ _PV = {
     chess.KING:   0,
 }
 
+# MVV-LVA scores precomputed as [victim piece type][attacker piece type]
+_MVV_LVA = [[10_000 * _PV.get(victim, 0) - _PV.get(attacker, 0) for attacker in range(7)] for victim in range(7)]
+
+# Piece values for SEE: the king is "worth" enough that it never recaptures into a defended square
+_SEE_VALUE = [0, 100, 320, 330, 500, 900, 20_000]
+
+# Aspiration windows: half-width around the previous iteration's score, widened 4x on every
+# fail until it passes the limit and the full window is used
+ASPIRATION_WINDOW = 50
+ASPIRATION_MAX_WINDOW = 1000
+
+# Null-move pruning: depth reduction and minimum remaining depth
+NULL_MOVE_R = 2
+NULL_MOVE_MIN_DEPTH = 3
+
+# Late move reductions: quiet moves ordered after the first few are searched shallower
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 3
+
 # Quiescence search configuration
 QUIESCENCE_MAX_DEPTH = 4  # Prevent infinite quiescence search (optimized for speed)
 
-@dataclass
-class _Entry:
-    depth: int
-    flag: int
-    score: int
-    move: Optional[chess.Move]
-
-def _tt_key(b: chess.Board) -> Tuple[str, bool, int, Optional[int]]:
+def _tt_key(b: SearchBoard) -> int:
     """
-    Compact position key for transposition table.
+    Compact position key for transposition table: the incrementally maintained Zobrist hash.
     Note: Excludes halfmove clock, so 50-move rule positions may collide.
     """
-    return (b.board_fen(), b.turn, b.castling_rights, b.ep_square)
+    return b.zobrist
 
-def _mvv_lva(b: chess.Board, m: chess.Move) -> int:
+def _mvv_lva(b: SearchBoard, m: chess.Move) -> int:
     """
     MVV-LVA scoring for captures: prioritize capturing valuable pieces
-    with less valuable attackers.
+    with less valuable attackers. Returns 0 for non-captures.
     """
-    if not b.is_capture(m):
+    piece_types = b.piece_types
+    to_sq = m.to_square
+    if b.occupied_co[not b.turn] & chess.BB_SQUARES[to_sq]:
+        victim = piece_types[to_sq]
+    elif to_sq == b.ep_square and piece_types[m.from_square] == chess.PAWN:
+        victim = chess.PAWN  # En passant: target square is empty
+    else:
         return 0
 
-    # Get victim value
-    victim = b.piece_at(m.to_square)
-    if victim is None and b.is_en_passant(m):
-        v_val = _PV[chess.PAWN]
-    else:
-        v_val = _PV[victim.piece_type] if victim else 0
+    return _MVV_LVA[victim][piece_types[m.from_square]]
 
-    # Get attacker value
-    attacker = b.piece_at(m.from_square)
-    a_val = _PV[attacker.piece_type] if attacker else 0
+def best_capture(b: SearchBoard, moves: Iterable[chess.Move]) -> chess.Move:
+    """
+    Best move by MVV-LVA alone, or the first move when none captures. A zero-depth
+    choice for when there is no time left to search at all.
+    """
+    return max(moves, key=lambda m: _mvv_lva(b, m))
 
-    return 10_000 * v_val - a_val
+def _see(b: SearchBoard, m: chess.Move) -> int:
+    """
+    Static Exchange Evaluation of a capture (swap-off algorithm).
+    Plays out the exchange on the target square, each side recapturing with its
+    least valuable attacker (x-rays appear as pieces leave the occupancy), and
+    returns the material balance for the side making the capture. Pins are ignored.
+    """
+    to_sq = m.to_square
+    occupied = b.occupied ^ chess.BB_SQUARES[m.from_square]
+    victim = b.piece_types[to_sq]
+    if not victim:
+        # En passant: the captured pawn is behind the target square
+        victim = chess.PAWN
+        occupied ^= chess.BB_SQUARES[to_sq - 8 if b.turn == chess.WHITE else to_sq + 8]
+
+    gain = [_SEE_VALUE[victim]]
+    on_square = b.piece_types[m.from_square]
+    if m.promotion:
+        gain[0] += _SEE_VALUE[m.promotion] - _SEE_VALUE[chess.PAWN]
+        on_square = m.promotion
+
+    pieces = (b.pawns, b.knights, b.bishops, b.rooks, b.queens, b.kings)
+    side = not b.turn
+    while True:
+        attackers = b.attackers_mask(side, to_sq, occupied) & occupied
+        if not attackers:
+            break
+        # Least valuable attacker recaptures (attackers is non-empty, so the loop always breaks)
+        for attacker_type in chess.PIECE_TYPES:
+            attacker_bb = pieces[attacker_type - 1] & attackers
+            if attacker_bb:
+                break
+        gain.append(_SEE_VALUE[on_square] - gain[-1])
+        on_square = attacker_type
+        occupied ^= attacker_bb & -attacker_bb
+        side = not side
+
+    # Either side may stop capturing when continuing would lose material
+    for i in range(len(gain) - 1, 0, -1):
+        gain[i - 1] = -max(-gain[i - 1], gain[i])
+    return gain[0]
+
+def _new_killers() -> Killers:
+    """Two killer move slots per ply: quiet moves that caused a beta cutoff at that ply."""
+    return [[None, None] for _ in range(MAX_PLY + 1)]
+
+def _new_history() -> History:
+    """History table indexed [color][from_square][to_square], bumped by depth^2 on quiet cutoffs."""
+    return [[[0] * 64 for _ in range(64)] for _ in range(2)]
+
+def new_search_tables(search_tt: Optional[SearchTable] = None) -> tuple[SearchTable, Killers, History]:
+    """
+    (search table, killers, history) for a caller that deepens by calling
+    pick_move_with_score() once per depth, so each depth reuses the previous one's tables.
+    Pass search_tt to keep a table from earlier searches; killers and history start fresh.
+    """
+    return search_tt if search_tt is not None else SearchTable(), _new_killers(), _new_history()
+
+def _store_killer(killers: Killers, history: History, b: chess.Board, m: chess.Move, depth: int, ply: int) -> None:
+    """Record a quiet move that caused a beta cutoff."""
+    slots = killers[ply]
+    if slots[0] != m:
+        slots[1] = slots[0]
+        slots[0] = m
+    history[b.turn][m.from_square][m.to_square] += depth * depth
 
-def _order_moves(b: chess.Board, moves, tt_move: Optional[chess.Move]) -> list:
+def _check_squares(b: chess.Board) -> list[int]:
     """
-    Order moves for better alpha-beta pruning:
+    For each piece type, the squares from which a piece of the side to move would attack
+    the enemy king (sliders use the current occupancy). Discovered checks are not covered.
+    """
+    king_sq = b.king(not b.turn)
+    if king_sq is None:
+        return [0] * 7
+    occupied = b.occupied
+    diagonal = chess.BB_DIAG_ATTACKS[king_sq][chess.BB_DIAG_MASKS[king_sq] & occupied]
+    straight = (chess.BB_RANK_ATTACKS[king_sq][chess.BB_RANK_MASKS[king_sq] & occupied] |
+                chess.BB_FILE_ATTACKS[king_sq][chess.BB_FILE_MASKS[king_sq] & occupied])
+    return [
+        0,
+        chess.BB_PAWN_ATTACKS[not b.turn][king_sq],  # Where our pawn would attack the king
+        chess.BB_KNIGHT_ATTACKS[king_sq],
+        diagonal,
+        straight,
+        diagonal | straight,
+        0,
+    ]
+
+# Sort key for (score, move, ...) tuples: a C itemgetter instead of a Python call per move
+_score_key = operator.itemgetter(0)
+
+def _score_moves(b: SearchBoard, moves: Iterable[chess.Move], tt_move: Optional[chess.Move],
+                 killers: Optional[list[Optional[chess.Move]]] = None,
+                 history: Optional[History] = None) -> list[ScoredMove]:
+    """
+    Score and sort moves for better alpha-beta pruning:
     1. TT/PV move (from previous search)
     2. Promotions (especially queen)
     3. Captures (MVV-LVA)
-    4. Checks
-    5. Quiet moves
+    4. Killer moves (quiet cutoffs at this ply)
+    5. Direct checks
+    6. Quiet moves by history score
+    Every move is scored once in a single loop over locals. Returns (score, move,
+    is_capture, gives_direct_check) tuples, best first, so the search can reuse the flags.
     """
-    def _score(m: chess.Move) -> int:
-        s = 0
-
-        # TT move gets highest priority
-        if tt_move is not None and m == tt_move:
-            s += SCORE_TT_MOVE
-
-        # Promotions are often strong
-        if m.promotion:
-            s += SCORE_PROMOTION_BASE + _PV.get(m.promotion, 0)
+    # gives_check() pushes and pops every move; test the landing square against attack masks instead
+    check_squares = _check_squares(b)
+    piece_types = b.piece_types
+    enemy = b.occupied_co[not b.turn]
+    ep_square = b.ep_square
+    killer_1, killer_2 = killers if killers is not None else (None, None)
+    side_history = history[b.turn] if history is not None else None
+    bb_squares = chess.BB_SQUARES
+
+    scored = []
+    for m in moves:
+        from_sq, to_sq, promotion = m.from_square, m.to_square, m.promotion
+        mover = piece_types[from_sq]
+        check = bool(check_squares[promotion or mover] & bb_squares[to_sq])
+
+        if enemy & bb_squares[to_sq]:
+            capture = _MVV_LVA[piece_types[to_sq]][mover]
+        elif to_sq == ep_square and mover == chess.PAWN:
+            capture = _MVV_LVA[chess.PAWN][chess.PAWN]
+        else:
+            capture = 0
 
-        # Captures (MVV-LVA)
-        if b.is_capture(m):
-            s += SCORE_CAPTURE_BASE + _mvv_lva(b, m)
+        # TT move goes first, nothing else to score
+        if m == tt_move:
+            scored.append((SCORE_TT_MOVE, m, bool(capture), check))
+            continue
 
         # Checks (but don't let this dominate)
-        if b.gives_check(m):
-            s += SCORE_CHECK
+        s = SCORE_CHECK if check else 0
 
-        return s
-
-    ml = list(moves)
-    ml.sort(key=_score, reverse=True)
-    return ml
+        # Promotions are often strong
+        if promotion:
+            s += SCORE_PROMOTION_BASE + _PV[promotion]
+
+        # Captures (MVV-LVA), then quiet moves: killers first, then history
+        if capture:
+            s += SCORE_CAPTURE_BASE + capture
+        elif not promotion:
+            if m == killer_1:
+                s += SCORE_KILLER_1
+            elif m == killer_2:
+                s += SCORE_KILLER_2
+            elif side_history is not None:
+                s += min(side_history[from_sq][to_sq], HISTORY_MAX)
+
+        scored.append((s, m, bool(capture), check))
+
+    scored.sort(key=_score_key, reverse=True)
+    return scored
+
+def _order_moves(b: SearchBoard, moves: Iterable[chess.Move], tt_move: Optional[chess.Move],
+                 killers: Optional[list[Optional[chess.Move]]] = None,
+                 history: Optional[History] = None) -> list[chess.Move]:
+    """The moves in _score_moves() order."""
+    return [entry[1] for entry in _score_moves(b, moves, tt_move, killers, history)]
+
+def _has_non_pawn_material(b: chess.Board) -> bool:
+    """True if the side to move has a piece besides pawns and king (null move is unsafe in zugzwang-prone endings)."""
+    return bool(b.occupied_co[b.turn] & ~b.pawns & ~b.kings)
 
 def _is_draw(board: chess.Board) -> bool:
     """
-    Fast draw detection.
-    Note: is_game_over() is expensive, so check specific conditions.
+    Fast draw detection, cheapest test first.
+    Note: is_game_over() is expensive, so check specific conditions. The threefold claim
+    only runs once the position has already occurred twice, and stalemate is left to the
+    caller, which finds it from an empty move list.
     """
-    return (board.is_stalemate() or
-            board.is_insufficient_material() or
-            board.can_claim_fifty_moves() or
-            board.can_claim_threefold_repetition())
+    return (board.halfmove_clock >= 100 or
+            (board.is_repetition(2) and board.can_claim_threefold_repetition()) or
+            board.is_insufficient_material())
 
-def quiescence(board: chess.Board,
+def quiescence(board: SearchBoard,
                alpha: int,
                beta: int,
-               table: TranspositionTable,
-               q_depth: int = 0) -> int:
+               table: Optional[TranspositionTable],
+               q_depth: int = 0,
+               ply: int = 0,
+               color: Optional[int] = None) -> int:
     """
     Quiescence search: only search captures and checks to avoid horizon effect.
     OPTIMIZED: Only checks in check, prioritizes good captures.
+    ply is the distance from the root where quiescence started, so mates keep their distance.
+    color is +1 if White is to move, else -1; worked out from board.turn when omitted, then
+    negated on each recursive call instead of being re-derived at every node.
     """
+    if color is None:
+        color = 1 if board.turn == chess.WHITE else -1
+
     # Prevent infinite quiescence
     if q_depth >= QUIESCENCE_MAX_DEPTH:
-        color = 1 if board.turn == chess.WHITE else -1
         return color * evaluate(board, table)
 
     # Check for immediate terminal conditions
@@ -140,7 +316,6 @@ def quiescence(board: chess.Board,
     # Stand-pat: can we already cause a beta cutoff?
     # Don't stand pat if we're in check (must search all moves)
     if not in_check:
-        color = 1 if board.turn == chess.WHITE else -1
         stand_pat = color * evaluate(board, table)
 
         if stand_pat >= beta:
@@ -154,44 +329,42 @@ def quiescence(board: chess.Board,
         if stand_pat < alpha - 1000:
             return alpha
 
-    # Generate tactical moves
     if in_check:
         # When in check, must search all legal moves
-        tactical_moves = list(board.legal_moves)
+        tactical_moves = list(board.generate_legal_moves())
+        if not tactical_moves:
+            return -MATE_SCORE + ply + q_depth  # Checkmate
     else:
-        # Only search captures and queen promotions (checks are expensive to calculate)
-        tactical_moves = []
-        for m in board.legal_moves:
-            if board.is_capture(m):
-                # SEE (Static Exchange Evaluation) pruning:
-                # Skip obviously bad captures
-                attacker = board.piece_at(m.from_square)
-                victim = board.piece_at(m.to_square)
-                if attacker and victim:
-                    if _PV[attacker.piece_type] > _PV[victim.piece_type] + 200:
-                        continue  # Skip bad capture (e.g., rook takes pawn)
-                tactical_moves.append(m)
-            elif m.promotion == chess.QUEEN:
-                tactical_moves.append(m)
-
-    # No tactical moves and not in check: return stand-pat
-    if not tactical_moves and not in_check:
-        return alpha
-
-    # Check for checkmate (only if in check and no legal moves)
-    if in_check and not tactical_moves:
-        return -MATE_SCORE + q_depth
-
-    # Order tactical moves (simple ordering, no full sort)
-    if not in_check:
-        # Order by MVV-LVA for captures
-        tactical_moves.sort(key=lambda m: _mvv_lva(board, m), reverse=True)
+        # Only search captures and queen promotions (checks are expensive to calculate).
+        # Generate just those, scoring each capture with MVV-LVA as it is produced.
+        piece_types = board.piece_types
+        scored = []
+        for m in board.generate_legal_captures():
+            # SEE (Static Exchange Evaluation) pruning: skip captures that lose material
+            if _see(board, m) < 0:
+                continue
+            victim = piece_types[m.to_square] or chess.PAWN  # En passant lands on an empty square
+            scored.append((_MVV_LVA[victim][piece_types[m.from_square]], m))
+        for m in board.generate_legal_moves(board.pawns & board.occupied_co[board.turn],
+                                            chess.BB_BACKRANKS & ~board.occupied):
+            if m.promotion == chess.QUEEN:
+                scored.append((0, m))
+
+        # No tactical moves and not in check: return stand-pat, unless there is no move at all
+        if not scored:
+            if not any(board.generate_legal_moves()):
+                return -CONTEMPT  # Stalemate
+            return alpha
+
+        scored.sort(key=_score_key, reverse=True)
+        tactical_moves = [m for _, m in scored]
 
-    # Search tactical moves
+    # Search tactical moves; bind the hot methods once (LOAD_FAST instead of attribute lookups per move)
+    push, pop = board.push, board.pop
     for m in tactical_moves:
-        board.push(m)
-        score = -quiescence(board, -beta, -alpha, table, q_depth + 1)
-        board.pop()
+        push(m)
+        score = -quiescence(board, -beta, -alpha, table, q_depth + 1, ply, -color)
+        pop()
 
         if score >= beta:
             return beta
@@ -201,77 +374,123 @@ def quiescence(board: chess.Board,
 
     return alpha
 
-def negamax(board: chess.Board,
+def negamax(board: SearchBoard,
             depth: int,
             alpha: int,
             beta: int,
-            table: TranspositionTable,
-            search_tt: Dict[Tuple[str, bool, int, Optional[int]], _Entry],
-            ply: int = 0) -> int:
+            table: Optional[TranspositionTable],
+            search_tt: SearchTable,
+            ply: int = 0,
+            killers: Optional[Killers] = None,
+            history: Optional[History] = None) -> int:
     """
-    Negamax with alpha-beta pruning, transposition table, and extensions.
+    Negamax with alpha-beta pruning (principal variation search), transposition table, and extensions.
     Returns score from current player's perspective.
     """
+    if search_stop.is_set():
+        raise SearchAbortedError
+
     # Prevent stack overflow in deep searches
     if ply >= MAX_PLY:
         color = 1 if board.turn == chess.WHITE else -1
         return color * evaluate(board, table)
 
-    # Draw contempt for claimable draws (nudge away from easy repetition/50-move)
-    if board.can_claim_threefold_repetition() or board.can_claim_fifty_moves():
+    # Draw contempt (nudge away from easy repetition/50-move). A repetition inside the
+    # search is scored as a draw already: if it was good once, the side to move can repeat it.
+    # Checkmate and stalemate are detected from the move list below, not by extra move generation.
+    if board.halfmove_clock >= 100 or board.is_repetition(2) or board.is_insufficient_material():
         return -CONTEMPT
 
-    # Check for immediate terminal conditions
-    if board.is_checkmate():
-        return -MATE_SCORE + ply  # Prefer shorter mates
-
-    if _is_draw(board):
-        return -CONTEMPT  # Slight penalty for draws
-
     key = _tt_key(board)
     orig_alpha, orig_beta = alpha, beta
 
     # Probe transposition table
-    tte = search_tt.get(key)
-    tt_move = None
+    tte = search_tt.probe(key)
+    tt_move_code = 0
 
-    if tte is not None and tte.depth >= depth:
-        tt_move = tte.move
+    if tte is not None:
+        tt_depth, tt_flag, tt_score, tt_move_code = tte  # Use move even if depth insufficient
+        if tt_score > MATE_BOUND:
+            tt_score -= ply
+        elif tt_score < -MATE_BOUND:
+            tt_score += ply
 
         # Use stored bounds if depth is sufficient
-        if tte.flag == TT_EXACT:
-            return tte.score
-        elif tte.flag == TT_LOWER:
-            alpha = max(alpha, tte.score)
-        elif tte.flag == TT_UPPER:
-            beta = min(beta, tte.score)
+        if tt_depth >= depth:
+            if tt_flag == TT_EXACT:
+                return tt_score
+            elif tt_flag == TT_LOWER:
+                alpha = max(alpha, tt_score)
+            elif tt_flag == TT_UPPER:
+                beta = min(beta, tt_score)
 
-        if alpha >= beta:
-            return tte.score
-    elif tte is not None:
-        tt_move = tte.move  # Use move even if depth insufficient
+            if alpha >= beta:
+                return tt_score
 
     # Leaf node: enter quiescence search
     if depth <= 0:
-        return quiescence(board, alpha, beta, table)
+        return quiescence(board, alpha, beta, table, 0, ply)
+
+    tt_move = decode_move(tt_move_code)
+
+    if killers is None:
+        killers = _new_killers()
+    if history is None:
+        history = _new_history()
+
+    # Null-move pruning: if passing still fails high on a non-PV node, our move will too.
+    # Not against a mate-score beta: a null-move "proof" there says nothing about the mate.
+    in_check = board.is_check()
+    pv_node = beta - alpha > 1
+    if (depth >= NULL_MOVE_MIN_DEPTH and not pv_node and not in_check and beta < MATE_SCORE - MAX_PLY
+            and _has_non_pawn_material(board) and board.move_stack and board.move_stack[-1]):
+        board.push(chess.Move.null())
+        score = -negamax(board, depth - 1 - NULL_MOVE_R, -beta, -beta + 1, table, search_tt, ply + 1, killers, history)
+        board.pop()
+        if score >= beta:
+            return beta
+
+    # Generate moves once: an empty list is checkmate or stalemate
+    moves = list(board.generate_legal_moves())
+    if not moves:
+        return -MATE_SCORE + ply if in_check else -CONTEMPT  # Prefer shorter mates
 
     best_score = -INF
     best_move = None
-    moves_searched = 0
 
-    # Search all legal moves
-    for m in _order_moves(board, board.legal_moves, tt_move):
-        board.push(m)
+    killer_moves = killers[ply]
+    can_reduce = depth >= LMR_MIN_DEPTH and not in_check
+    # Bind the hot methods once (LOAD_FAST instead of attribute lookups in the move loop)
+    push, pop = board.push, board.pop
+
+    # Search all legal moves (PVS: full window for the first move, null window for the rest).
+    # Capture and check flags come from move scoring; the check flag covers direct checks only.
+    for i, (_, m, capture, gives_check) in enumerate(_score_moves(board, moves, tt_move, killer_moves, history)):
+        quiet = not m.promotion and not capture
+        push(m)
 
-        # Check extension: if resulting position is check, extend by 1 ply
+        # Check extension: if the move gives check, extend by 1 ply
         next_depth = depth - 1
-        if board.is_check():
+        if gives_check:
             next_depth += 1
 
-        score = -negamax(board, next_depth, -beta, -alpha, table, search_tt, ply + 1)
-        board.pop()
-
-        moves_searched += 1
+        if i == 0:
+            score = -negamax(board, next_depth, -beta, -alpha, table, search_tt, ply + 1, killers, history)
+        else:
+            score = alpha + 1  # Forces the null-window search unless a reduced search fails low
+            # LMR: late quiet moves rarely raise alpha, so try them shallower first
+            if (can_reduce and i >= LMR_MIN_MOVES and quiet and not gives_check
+                    and m != tt_move and m not in killer_moves):
+                reduction = 2 if i > 6 else 1
+                score = -negamax(board, next_depth - reduction, -alpha - 1, -alpha, table, search_tt, ply + 1,
+                                 killers, history)
+
+            # Prove the move is no better than alpha; re-search with the full window only if it is
+            if score > alpha:
+                score = -negamax(board, next_depth, -alpha - 1, -alpha, table, search_tt, ply + 1, killers, history)
+            if alpha < score < beta:
+                score = -negamax(board, next_depth, -beta, -alpha, table, search_tt, ply + 1, killers, history)
+        pop()
 
         if score > best_score:
             best_score = score
@@ -280,17 +499,12 @@ def negamax(board: chess.Board,
         if best_score > alpha:
             alpha = best_score
 
-        # Beta cutoff
+        # Beta cutoff: remember quiet moves for ordering sibling nodes
         if alpha >= beta:
+            if quiet:
+                _store_killer(killers, history, board, m, depth, ply)
             break
 
-    # No legal moves means checkmate or stalemate (already handled above)
-    if moves_searched == 0:
-        if board.is_checkmate():
-            return -MATE_SCORE + ply
-        else:
-            return -CONTEMPT  # Stalemate
-
     # Store to transposition table
     if best_score <= orig_alpha:
         flag = TT_UPPER  # All moves failed low
@@ -299,79 +513,206 @@ def negamax(board: chess.Board,
     else:
         flag = TT_EXACT  # Exact score
 
-    search_tt[key] = _Entry(depth=depth, flag=flag, score=best_score, move=best_move)
+    # Mate scores count plies from the root; store them as distance from this node so
+    # the entry stays right wherever (and in whichever search) the position comes up again
+    tt_score = best_score
+    if tt_score > MATE_BOUND:
+        tt_score += ply
+    elif tt_score < -MATE_BOUND:
+        tt_score -= ply
+    search_tt.store(key, depth, flag, tt_score, best_move)
 
     return best_score
 
+def _root_search(board: SearchBoard, legal: list[chess.Move], depth: int, alpha: int, beta: int,
+                 table: Optional[TranspositionTable], search_tt: SearchTable, killers: Killers, history: History,
+                 pv_move: Optional[chess.Move]) -> tuple[int, chess.Move]:
+    """
+    Search the root moves at one depth within (alpha, beta), PVS style, with pv_move first.
+    Returns (best score, best move); stops early on a fail high.
+    """
+    best_score, best_move = -INF, legal[0]
+    for i, m in enumerate(_order_moves(board, legal, pv_move, killers[0], history)):
+        board.push(m)
+        if i == 0:
+            score = -negamax(board, depth - 1, -beta, -alpha, table, search_tt, 1, killers, history)
+        else:
+            score = -negamax(board, depth - 1, -alpha - 1, -alpha, table, search_tt, 1, killers, history)
+            if alpha < score < beta:
+                score = -negamax(board, depth - 1, -beta, -alpha, table, search_tt, 1, killers, history)
+        board.pop()
+
+        if score > best_score:
+            best_score = score
+            best_move = m
+
+        if score > alpha:
+            alpha = score
+            if alpha >= beta:
+                break
+
+    return best_score, best_move
+
+# Root-parallel search: a process pool reused across pick_move calls, and the tables each worker keeps
+_root_pool: Optional[ProcessPoolExecutor] = None
+_root_pool_workers = 0  # worker count _root_pool was started with
+_worker_tables: Optional[tuple[TranspositionTable, SearchTable, Killers, History]] = None
+
+def _get_root_pool(workers: int) -> ProcessPoolExecutor:
+    global _root_pool, _root_pool_workers
+    if _root_pool is None or _root_pool_workers != workers:
+        if _root_pool is not None:
+            _root_pool.shutdown()
+        _root_pool = ProcessPoolExecutor(max_workers=workers)
+        _root_pool_workers = workers
+    return _root_pool
+
+def _search_root_move(fen: str, uci_history: list[str], move_uci: str, depth: int, alpha: int = -INF) -> int:
+    """
+    Worker task: score one root move, searching with the window (alpha, INF) so a move that
+    cannot beat alpha fails low cheaply.
+    Each worker process keeps its own eval cache and search tables between tasks (Lazy SMP style).
+    """
+    global _worker_tables
+    if _worker_tables is None:
+        _worker_tables = (TranspositionTable(), SearchTable(), _new_killers(), _new_history())
+    table, search_tt, killers, history_table = _worker_tables
+
+    board = SearchBoard(fen)
+    for uci in uci_history:
+        board.push_uci(uci)
+    board.push_uci(move_uci)
+    return -negamax(board, depth - 1, -INF, -alpha, table, search_tt, 1, killers, history_table)
+
+def _pick_move_parallel(board: SearchBoard, legal: list[chess.Move], depth: int, table: Optional[TranspositionTable],
+                        prev_best: Optional[chess.Move], workers: int,
+                        search_tt: SearchTable, killers: Killers, history: History) -> tuple[chess.Move, int]:
+    """
+    Young Brothers Wait at the root: search the first (eldest) move here to get a real
+    alpha, then split the remaining moves across worker processes, each searched against
+    that alpha. Returns (best move, score); ties go to the earlier move.
+    """
+    ordered = _order_moves(board, legal, prev_best)
+    best_move = ordered[0]
+    board.push(best_move)
+    best_score = -negamax(board, depth - 1, -INF, INF, table, search_tt, 1, killers, history)
+    board.pop()
+
+    fen = board.root().fen()
+    uci_history = [m.uci() for m in board.move_stack]
+    pool = _get_root_pool(workers)
+    futures = [pool.submit(_search_root_move, fen, uci_history, m.uci(), depth, best_score) for m in ordered[1:]]
+
+    for m, future in zip(ordered[1:], futures, strict=True):
+        score = future.result()
+        if score > best_score:
+            best_score, best_move = score, m
+    return best_move, best_score
+
+# Root searches run by pick_move_with_score(), and how many of them fell outside their aspiration window
+aspiration_stats = {"searches": 0, "re_searches": 0}
+
 def pick_move(board: chess.Board,
               depth: int,
-              table: TranspositionTable,
-              allowed_moves: Optional[list] = None,
-              prev_best: Optional[chess.Move] = None) -> chess.Move:
+              table: Optional[TranspositionTable],
+              allowed_moves: Optional[list[chess.Move]] = None,
+              prev_best: Optional[chess.Move] = None,
+              workers: int = 1) -> chess.Move:
+    """
+    Root search driver. Finds the best move at the given depth, deepening iteratively from
+    depth 1 with aspiration windows. Same as pick_move_with_score() without the score.
+    """
+    return pick_move_with_score(board, depth, table, allowed_moves, prev_best, workers)[0]
+
+def pick_move_with_score(board: chess.Board,
+                         depth: int,
+                         table: Optional[TranspositionTable],
+                         allowed_moves: Optional[list[chess.Move]] = None,
+                         prev_best: Optional[chess.Move] = None,
+                         workers: int = 1,
+                         prev_score: Optional[int] = None,
+                         search_tt: Optional[SearchTable] = None,
+                         killers: Optional[Killers] = None,
+                         history: Optional[History] = None,
+                         root_moves: Optional[tuple[chess.Move, ...]] = None) -> tuple[chess.Move, Optional[int]]:
     """
-    Root search driver. Finds the best move at the given depth.
+    Root search driver. Finds the best move at the given depth, deepening iteratively from
+    depth 1 with aspiration windows, and returns (best move, score for the side to move).
 
     Args:
         board: Current position
         depth: Search depth
-        table: Evaluation transposition table
+        table: Evaluation transposition table (None: evaluate() uses its own)
         allowed_moves: Optional list of legal moves to consider (for Lichess bot)
-        prev_best: Best move from previous iteration (for move ordering)
+        prev_best: Best move from a previous search (searched first)
+        workers: Processes to split the root moves across. The first move is searched
+            here, the rest in parallel against its score with per-worker tables, so this
+            only pays off with several cores. Daemonic processes (e.g. lichess-bot game
+            workers) cannot start a pool and always search sequentially.
+        prev_score: Score of the previous depth, from a caller that deepens itself. Only this
+            depth is searched, in an aspiration window around prev_score.
+        search_tt: Search transposition table from new_search_tables(), to reuse across
+            calls (a fresh one if omitted)
+        killers: Killer move slots from new_search_tables() (fresh ones if omitted)
+        history: History heuristic table from new_search_tables() (a fresh one if omitted)
+        root_moves: Legal root moves the caller already generated and filtered; replaces
+            move generation and the allowed_moves filter.
 
     Returns:
-        Best move found
+        (best move, score); the score is None when there was nothing to search
     """
+    # Search on a board that maintains its Zobrist key incrementally
+    if not isinstance(board, SearchBoard):
+        board = SearchBoard.from_board(board)
+
     # Get legal moves
-    legal = list(board.legal_moves)
-    if allowed_moves:
-        allow_uci = {m.uci() for m in allowed_moves}
-        legal = [m for m in legal if m.uci() in allow_uci]
+    if root_moves is not None:
+        legal = list(root_moves)
+    else:
+        legal = list(board.generate_legal_moves())
+    if allowed_moves and root_moves is None:
+        # Compare moves as int tuples: uci() builds a string per move
+        allow_key = {(m.from_square, m.to_square, m.promotion) for m in allowed_moves}
+        legal = [m for m in legal if (m.from_square, m.to_square, m.promotion) in allow_key]
 
     if not legal:
-        return chess.Move.null()
+        return chess.Move.null(), None
 
     if len(legal) == 1:
-        return legal[0]  # Only one legal move
-
-    # Create search transposition table
-    search_tt: Dict[Tuple[str, bool, int, Optional[int]], _Entry] = {}
-
-    best_move = legal[0]
-    best_score = -INF
-    alpha = -INF
-    beta = INF
-
-    # Aspiration window for deeper searches
-    if prev_best and prev_best in legal and depth >= 4:
-        # Get score from previous iteration
-        board.push(prev_best)
-        prev_score = -negamax(board, depth - 1, -INF, INF, table, search_tt, 1)
-        board.pop()
-
-        # Set aspiration window (±50 centipawns)
-        window = 50
-        alpha = prev_score - window
-        beta = prev_score + window
-
-    # Search all root moves
-    for m in _order_moves(board, legal, prev_best):
-        board.push(m)
-
-        # Search with aspiration window
-        score = -negamax(board, depth - 1, -beta, -alpha, table, search_tt, 1)
-
-        # If we fail outside aspiration window, re-search with full window
-        if (score <= alpha or score >= beta) and depth >= 4:
-            score = -negamax(board, depth - 1, -INF, INF, table, search_tt, 1)
-
-        board.pop()
-
-        if score > best_score:
-            best_score = score
-            best_move = m
-
-        # Update alpha for next move
-        if score > alpha:
-            alpha = score
-
-    return best_move
+        return legal[0], None  # Only one legal move
+
+    # Search transposition table and quiet-move ordering tables (shared by all iterations)
+    if search_tt is None:
+        search_tt = SearchTable()
+    if killers is None:
+        killers = _new_killers()
+    if history is None:
+        history = _new_history()
+
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        return _pick_move_parallel(board, legal, depth, table, prev_best, workers, search_tt, killers, history)
+
+    # Iterative deepening: each iteration seeds the TT and the PV move for the next one,
+    # and its score centres the next iteration's aspiration window. A caller that passes
+    # prev_score has done the shallower depths already.
+    best_move = prev_best if prev_best in legal else legal[0]
+    score = prev_score
+    for d in range(1 if prev_score is None else depth, depth + 1):
+        window = ASPIRATION_WINDOW
+        aspiration_stats["searches"] += 1
+        while True:
+            if score is None or window > ASPIRATION_MAX_WINDOW:
+                alpha, beta = -INF, INF
+            else:
+                alpha, beta = score - window, score + window
+            result, move = _root_search(board, legal, d, alpha, beta, table, search_tt, killers, history, best_move)
+            if alpha < result < beta or (alpha == -INF and beta == INF):
+                break
+            # Failed outside the window: widen it and search this depth again
+            aspiration_stats["re_searches"] += 1
+            if result >= beta:
+                best_move = move  # A fail-high move beats the old PV move, keep it first
+            window *= 4
+        score, best_move = result, move
+
+    return best_move, score
@@ -1,32 +1,20 @@
 # evaluation.py
 import chess
 import TranspositionTable
+from typing import Optional
 # --- Hook your PSTs here ---
-from PieceSquareTable import MG_PST, EG_PST  # dicts: piece type -> np.array[64], white-oriented
+from PieceSquareTable import MATERIAL, PHASE_WEIGHT, unpackScore
+from SearchBoard import SearchBoard, game_phase, material_score, pst_score
 
 MATE = 32000  # normalized mate score (centipawns)
 
-# Base material in centipawns (can be tuned).
-_MAT = {
-    chess.PAWN: 100,
-    chess.KNIGHT: 320,
-    chess.BISHOP: 330,
-    chess.ROOK: 500,
-    chess.QUEEN: 900,
-    chess.KING: 0,  # handled by checkmate; PSTs carry king activity
-}
+# Base material in centipawns (shared with SearchBoard's incremental material sum)
+_MAT = MATERIAL
 MG_VALUES = _MAT
 EG_VALUES = _MAT
 
 # Game-phase weights (standard total = 24)
-_PHASE_WEIGHT = {
-    chess.PAWN: 0,
-    chess.KNIGHT: 1,
-    chess.BISHOP: 1,
-    chess.ROOK: 2,
-    chess.QUEEN: 4,
-    chess.KING: 0,
-}
+_PHASE_WEIGHT = PHASE_WEIGHT
 _TOTAL_PHASE = 24
 
 # Small heuristics
@@ -34,95 +22,62 @@ TEMPO_BONUS = 10
 BISHOP_PAIR_MG = 30
 BISHOP_PAIR_EG = 40
 
+# Packed (mg * 65536 + eg) forms, so every term adds into one int and is unpacked once
+_TEMPO = TEMPO_BONUS * 65537
+_BISHOP_PAIR = BISHOP_PAIR_MG * 65536 + BISHOP_PAIR_EG
+
 def _game_phase(board: chess.Board) -> int:
-    """Return phase in [0.._TOTAL_PHASE]; higher => more middlegame."""
-    phase = 0
-    for pt, w in _PHASE_WEIGHT.items():
-        if w == 0:
-            continue
-        phase += w * (len(board.pieces(pt, chess.WHITE)) + len(board.pieces(pt, chess.BLACK)))
+    """Return phase in [0.._TOTAL_PHASE]; higher => more middlegame. Popcounts of both colours' piece bitboards."""
+    phase = game_phase(board)
     if phase > _TOTAL_PHASE:
         phase = _TOTAL_PHASE
-    if phase < 0:
-        phase = 0
     return phase
 
-def _pst_score(board: chess.Board, mg: bool) -> int:
-    """Piece-square table sum for both sides (white - black)."""
-    PST = MG_PST if mg else EG_PST
-    total = 0
-    # White pieces: use square as-is
-    for pt in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING):
-        for sq in board.pieces(pt, chess.WHITE):
-            total += int(PST[pt][sq])
-    # Black pieces: mirror squares to reuse white-oriented PST and subtract
-    for pt in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING):
-        for sq in board.pieces(pt, chess.BLACK):
-            total -= int(PST[pt][chess.square_mirror(sq)])
-    return int(total)
-
-def _material(board: chess.Board, mg: bool) -> int:
-    """Material sum (white - black)."""
-    VALS = MG_VALUES if mg else EG_VALUES
-    score = 0
-    for pt in (chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN):
-        score += VALS[pt] * len(board.pieces(pt, chess.WHITE))
-        score -= VALS[pt] * len(board.pieces(pt, chess.BLACK))
-    return score
+def _bishop_pair(board: chess.Board) -> int:
+    """Packed bonus for having both bishops."""
+    pairs = ((board.bishops & board.occupied_co[chess.WHITE]).bit_count() >= 2) - \
+            ((board.bishops & board.occupied_co[chess.BLACK]).bit_count() >= 2)
+    return _BISHOP_PAIR * pairs
 
-def _bishop_pair(board: chess.Board, mg: bool) -> int:
-    """Bonus for having both bishops."""
-    w_pair = len(board.pieces(chess.BISHOP, chess.WHITE)) >= 2
-    b_pair = len(board.pieces(chess.BISHOP, chess.BLACK)) >= 2
-    if mg:
-        return (BISHOP_PAIR_MG if w_pair else 0) - (BISHOP_PAIR_MG if b_pair else 0)
-    else:
-        return (BISHOP_PAIR_EG if w_pair else 0) - (BISHOP_PAIR_EG if b_pair else 0)
+# Eval cache used when evaluate() is called without a table
+_GLOBAL_TT = TranspositionTable.TranspositionTable()
 
-def evaluate(board: chess.Board, table) -> int:
+def evaluate(board: chess.Board, table: Optional[TranspositionTable.TranspositionTable] = None) -> int:
     """
     White-centric tapered evaluation (centipawns).
     Positive => good for White; Negative => good for Black.
     Uses material + PST (MG/EG) with game-phase blending, bishop-pair, and a small tempo bonus.
+    Mate, stalemate and draws are not detected here (that costs a full legal move generation);
+    the search finds them from its own move lists and draw checks.
+    Scores are cached in table, or in a module-level table if none is given.
     """
-    # Terminal outcomes (white-centric)
-    if board.is_game_over():
-        outcome = board.outcome()
-        if outcome is None or outcome.winner is None:
-            return 0  # draw
-        return MATE if outcome.winner is chess.WHITE else -MATE
-
-    # Transposition-table backed cache (if provided)
-    if table.exists(board):
-        blended = table.lookup(board)
-        return int(blended)
-
-    # Compute phase 0..24
-    phase = _game_phase(board)
-
-    # Middlegame & Endgame components
-    mg_score = 0
-    eg_score = 0
-
-    mg_score += _material(board, mg=True)
-    eg_score += _material(board, mg=False)
-
-    mg_score += _pst_score(board, mg=True)
-    eg_score += _pst_score(board, mg=False)
+    if table is None:
+        table = _GLOBAL_TT
+
+    # Transposition-table backed cache (if provided): one lookup, and a miss is stored under the same key
+    key = table.key(board)
+    cached = table.probe(key)
+    if cached is not None:
+        return cached
+
+    # Every term is a packed mg * 65536 + eg score. SearchBoard keeps phase, material
+    # and the piece-square sum up to date on push/pop; a plain board is scanned.
+    if isinstance(board, SearchBoard):
+        phase = board.phase
+        score = board.material + board.psq
+    else:
+        phase = _game_phase(board)
+        score = material_score(board) + pst_score(board)
 
-    mg_score += _bishop_pair(board, mg=True)
-    eg_score += _bishop_pair(board, mg=False)
+    score += _bishop_pair(board)
 
     # Tiny tempo bonus (white-centric)
-    tempo = TEMPO_BONUS if board.turn == chess.WHITE else -TEMPO_BONUS
-    mg_score += tempo
-    eg_score += tempo
+    score += _TEMPO if board.turn == chess.WHITE else -_TEMPO
 
-    # Safe, clamped tapered blend (avoid NumPy overflow if any np.int sneaks in)
+    # Clamped tapered blend
     phase = max(0, min(_TOTAL_PHASE, int(phase)))
-    mg_score = int(mg_score)
-    eg_score = int(eg_score)
+    mg_score, eg_score = unpackScore(score)
 
     blended = (mg_score * phase + eg_score * (_TOTAL_PHASE - phase)) // _TOTAL_PHASE
-    table.storePosition(board, blended)
+    table.storePosition(board, blended, key)
     return int(blended)
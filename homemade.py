@@ -139,6 +139,7 @@ class MyBot(ExampleEngine):
     def search(self, board: chess.Board, *args: HOMEMADE_ARGS_TYPE) -> PlayResult:
     # Parse args: (time_limit: Limit, ponder: bool, draw_offered: bool, root_moves: MOVE)
       time_limit = args[0] if (args and isinstance(args[0], Limit)) else None
+      ponder = len(args) >= 2 and args[1] is True
       root_moves = args[3] if (len(args) >= 4 and isinstance(args[3], list)) else None
 
       if isinstance(time_limit.time, (int, float)):
@@ -158,6 +159,7 @@ class MyBot(ExampleEngine):
           (root_moves if isinstance(root_moves, list) else None),
           my_time,
           my_inc,
+          ponder=ponder,
       )
 
       return PlayResult(move, None)
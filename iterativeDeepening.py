@@ -1,61 +1,184 @@
+import math
+import os
+import threading
 import time
+from functools import lru_cache
 from typing import Optional
-from alphabeta import pick_move
+from alphabeta import SearchAbortedError, aspiration_stats, best_capture, new_search_tables, pick_move_with_score, search_stop
+from SearchBoard import SearchBoard
+from TranspositionTable import SearchTable, TranspositionTable, decode_move
 import chess
+import chess.polyglot
+import logging
+
+# Search progress goes through logging: debug for per-depth detail, info for the decision.
+# %-style arguments are only formatted when the level is enabled.
+logger = logging.getLogger(__name__)
 
 # Configuration constants
 SAFETY_MARGIN = 0.88   # Use 88% of allocated time budget
 MIN_MOVE_TIME = 1.0    # Minimum time per move (seconds)
 PANIC_THRESHOLD = 5.0  # Switch to panic mode below this time
-PANIC_DEPTH = 4        # Maximum depth in panic mode
+PANIC_DEPTH = 2        # Maximum depth in panic mode
+PANIC_TIME_FRACTION = 0.15  # Share of the remaining time a panic search may use
+PANIC_MOVE_TIME = 2.0  # Below this, play best_capture() without searching
+DRAWISH_DEPTH = 4      # Maximum depth once the position has repeated or hit the 50-move limit
+DRAWISH_TIME = 1.0     # Maximum seconds spent on such a position
 INCREMENT_USAGE = 0.65 # Use 65% of increment in time calculation
 MAX_TIME_PER_MOVE = 0.20  # Never use more than 20% of remaining time on one move
+ROOT_WORKERS = 1  # Processes for the root-parallel search (1 = sequential, opt in with more)
+ASPIRATION_MIN_DEPTH = 4    # from this depth on, search only the new depth in a window around the last score
+PONDER_MAX_DEPTH = 6        # the ponder thread deepens until stopped, but never past this depth
 
 # New tuning for next-depth prediction / refusal
 PRED_INFLATION = 1.35       # extra safety on predicted next depth time
-HARD_FACTOR = 10.0          # require at least "last_time * HARD_FACTOR" free slack to start next depth
+HARD_FACTOR = 6.0           # require at least "last_time * HARD_FACTOR" free slack to start next depth
 MIN_SLACK_TO_START = 0.75   # seconds of slack we insist on before starting another depth
 PV_STABILITY_LENIENT = 0.70 # if PV stable 1 depth, require next depth to fit within 70% budget
 PV_STABILITY_STRICT = 0.55  # if PV stable 2+ depths, require within 55% budget
 MAX_RATIO_CAP = 24.0        # upper cap on growth factor (very conservative)
-BASELINE_RATIO_OPENING = 4.5
-BASELINE_RATIO_MIDDLEGAME = 6.5
-BASELINE_RATIO_ENDGAME = 5.5
+
+# Search timing runs on integer time.monotonic_ns() readings; seconds only appear in the logs
+_NS_PER_S = 1_000_000_000
+_MIN_PRED_NS = _NS_PER_S // 1000  # floor on a depth time when taking ratios (1 ms)
+
+# Search table kept warm across iterativeDeepen calls (entries are aged, not cleared)
+_TT_ENTRY_BYTES = 90  # two list slots plus the key and packed-entry ints
+_global_tt: Optional[SearchTable] = None
+
+def get_or_create_tt(size_mb: int = 128) -> SearchTable:
+    """Return the shared search table, creating it on first use with about size_mb of entries."""
+    global _global_tt
+    if _global_tt is None:
+        bits = max(10, (size_mb * 2 ** 20 // _TT_ENTRY_BYTES).bit_length() - 1)
+        _global_tt = SearchTable(bits)
+    return _global_tt
+
+# Polyglot opening book, probed before any search through the first BOOK_MAX_MOVE moves.
+# The reader is opened once and kept; _book_missing stops a missing book being looked for again.
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_MAX_MOVE = 15
+_book_reader: Optional[chess.polyglot.MemoryMappedReader] = None
+_book_missing = False
+
+def _book_move(board: chess.Board, root_moves: tuple[chess.Move, ...], restricted: bool) -> Optional[chess.Move]:
+    """Weighted random book move, or None if out of book; only among root_moves if restricted."""
+    global _book_reader, _book_missing
+    if _book_reader is None:
+        if _book_missing:
+            return None
+        try:
+            _book_reader = chess.polyglot.open_reader(BOOK_PATH)
+        except FileNotFoundError:
+            _book_missing = True
+            return None
+    excluded = [m for m in board.legal_moves if m not in root_moves] if restricted else []
+    try:
+        return _book_reader.weighted_choice(board, exclude_moves=excluded).move
+    except IndexError:
+        return None
+
+# Search on the predicted reply while the opponent thinks: started after our move when pondering
+# is allowed, stopped at the start of the next iterativeDeepen call. It fills the shared search
+# table, and its best move (by Zobrist key of the position it searched) seeds the next search.
+_ponder_thread: Optional[threading.Thread] = None
+_ponder_hint: Optional[tuple[int, chess.Move]] = None
+
+def _ponder(board: SearchBoard, table: Optional[TranspositionTable]) -> None:
+    """Deepen on board until search_stop is set, publishing each completed depth's move."""
+    global _ponder_hint
+    search_tt, killers, history = new_search_tables(get_or_create_tt())
+    move: Optional[chess.Move] = None
+    score: Optional[int] = None
+    try:
+        for depth in range(1, PONDER_MAX_DEPTH + 1):
+            window_score = score if depth >= ASPIRATION_MIN_DEPTH else None
+            move, score = pick_move_with_score(board, depth, table, prev_best=move, prev_score=window_score,
+                                               search_tt=search_tt, killers=killers, history=history)
+            if score is None:
+                return  # At most one legal move, nothing to search
+            _ponder_hint = (board.zobrist, move)
+    except SearchAbortedError:
+        pass
+
+def _start_ponder(board: SearchBoard, move: chess.Move, table: Optional[TranspositionTable]) -> None:
+    """Start pondering on the reply to move that the search table predicts, if it has one."""
+    global _ponder_thread
+    board = board.copy()
+    board.push(move)
+    tte = get_or_create_tt().probe(board.zobrist)
+    reply = decode_move(tte[3]) if tte is not None else None
+    if reply is None or not board.is_legal(reply):
+        return
+    board.push(reply)
+    logger.debug("Pondering on %s", reply)
+    search_stop.clear()
+    _ponder_thread = threading.Thread(target=_ponder, args=(board, table), daemon=True)
+    _ponder_thread.start()
+
+def _stop_ponder(key: int) -> Optional[chess.Move]:
+    """Stop the ponder thread and return its best move if it was pondering on this position."""
+    global _ponder_thread, _ponder_hint
+    if _ponder_thread is not None:
+        search_stop.set()
+        # The search raises at its next node, so this wait is short; the main search
+        # must not start while the ponder thread still writes to the shared tables
+        _ponder_thread.join()
+        _ponder_thread = None
+        search_stop.clear()
+    hint, _ponder_hint = _ponder_hint, None
+    if hint is not None and hint[0] == key:
+        return hint[1]
+    return None
+
+# Game phases, as classified by _classify_phase()
+PHASE_OPENING = 0
+PHASE_MIDDLEGAME = 1
+PHASE_EARLY_ENDGAME = 2
+PHASE_LATE_ENDGAME = 3
+
+# Per-phase settings, indexed by the phases above:
+# (default max depth, moves to go, time multiplier, baseline branching ratio, name)
+PHASE_CONFIG = (
+    (8, 35, 0.6, 4.5, "Opening"),
+    (12, 25, 1.2, 6.5, "Middlegame"),
+    (16, 20, 1.0, 5.5, "Early Endgame"),
+    (20, 15, 0.8, 5.5, "Late Endgame"),
+)
+
+def _classify_phase(piece_count: int, move_num: int) -> int:
+    """Game phase (PHASE_*) from the number of pieces on the board and the move number."""
+    # Each test adds one past the opening (28+ pieces up to move 15), middlegame (20+), early endgame (10+)
+    return ((piece_count < 28) | (move_num > 15)) + (piece_count < 20) + (piece_count < 10)
+
+def _board_phase(board: chess.Board) -> int:
+    """Game phase of a board; piece count is a popcount of the occupancy, not a piece_map() build."""
+    return _classify_phase(chess.popcount(board.occupied), board.fullmove_number)
 
 def calculate_time_allocation(remaining_time: float, increment: float,
-                             board: chess.Board, moves_to_go: Optional[int] = None) -> float:
-    """Conservative time budget per move."""
+                             board: chess.Board, moves_to_go: Optional[int] = None,
+                             phase: Optional[int] = None) -> float:
+    """Conservative time budget per move. Pass phase if the caller has already classified the board."""
     if remaining_time < PANIC_THRESHOLD:
         return max(MIN_MOVE_TIME, remaining_time * 0.25)
 
+    if phase is None:
+        phase = _board_phase(board)
+    # Rounded down to the quarter second and the twentieth of a second, so nearby clocks share an entry
+    return _time_allocation(int(remaining_time * 4), int(increment * 20), phase, moves_to_go)
+
+@lru_cache(maxsize=2048)
+def _time_allocation(remaining_q: int, increment_q: int, phase: int, moves_to_go: Optional[int]) -> float:
+    """calculate_time_allocation() outside panic mode, on quantized clock readings."""
+    remaining_time = remaining_q / 4
+    increment = increment_q / 20
+    _, phase_moves_to_go, phase_multiplier, _, _ = PHASE_CONFIG[phase]
     # Estimate moves remaining
     if moves_to_go is None:
-        piece_count = len(board.piece_map())
-        move_num = board.fullmove_number
-        if piece_count >= 28 and move_num <= 15:
-            moves_to_go = 35  # Opening
-        elif piece_count >= 20:
-            moves_to_go = 25  # Middlegame
-        elif piece_count >= 10:
-            moves_to_go = 20  # Early endgame
-        else:
-            moves_to_go = 15  # Late endgame
+        moves_to_go = phase_moves_to_go
 
     base_time = remaining_time / moves_to_go
     increment_bonus = increment * INCREMENT_USAGE
-
-    # phase multiplier
-    piece_count = len(board.piece_map())
-    move_num = board.fullmove_number
-    if piece_count >= 28 and move_num <= 15:
-        phase_multiplier = 0.6
-    elif piece_count >= 20:
-        phase_multiplier = 1.2
-    elif piece_count >= 10:
-        phase_multiplier = 1.0
-    else:
-        phase_multiplier = 0.8
-
     total_time = base_time * phase_multiplier + increment_bonus
 
     # caps & minimums
@@ -64,106 +187,148 @@ def calculate_time_allocation(remaining_time: float, increment: float,
     total_time = max(MIN_MOVE_TIME, total_time)
     return total_time
 
-def _phase_baseline_ratio(board: chess.Board) -> float:
+def _phase_baseline_ratio(phase: int) -> float:
     """Return a conservative baseline branching factor based on phase."""
-    piece_count = len(board.piece_map())
-    move_num = board.fullmove_number
-    if piece_count >= 28 and move_num <= 15:
-        return BASELINE_RATIO_OPENING
-    elif piece_count >= 20:
-        return BASELINE_RATIO_MIDDLEGAME
-    else:
-        return BASELINE_RATIO_ENDGAME
+    return PHASE_CONFIG[phase][3]
 
-def _predict_next_depth_time(completed_times: dict[int, float], board: chess.Board) -> float:
+def _predict_next_depth_time(depth_times: list[int], phase: int) -> int:
     """
-    Predict time for the next depth using the WORST observed ratio so far,
-    a phase-based baseline, and an inflation safety factor.
+    Predict time (ns) for the next depth, times an inflation safety factor.
+    depth_times holds the completed depths' times in order (depth 1 first).
+    With 3+ completed depths, fit log(time) = a + b * depth by least squares and
+    extrapolate one depth (exp(b) is the effective branching factor). With fewer,
+    use the observed ratio, never below a phase-based baseline.
     """
-    if not completed_times:
-        return 0.0
-    depths = sorted(completed_times.keys())
-    last_d = depths[-1]
-    last_t = completed_times[last_d]
-
-    # If only one depth, fall back to baseline
-    if len(depths) == 1:
-        ratio = _phase_baseline_ratio(board)
-    else:
-        prev_t = completed_times[depths[-2]]
-        raw_ratio = last_t / max(prev_t, 1e-3)
-
-        # If we have 3+ depths, consider the previous ratio too and use the worst
-        if len(depths) >= 3:
-            prev_raw = prev_t / max(completed_times[depths[-3]], 1e-3)
-            raw_ratio = max(raw_ratio, prev_raw)
-
+    n = len(depth_times)
+    if not n:
+        return 0
+    last_t = depth_times[-1]
+
+    if n >= 3:
+        # Depths are 1..n, so their mean and spread are closed-form
+        logs = [math.log(max(t, _MIN_PRED_NS)) for t in depth_times]
+        mean_d = (n + 1) / 2
+        mean_log = sum(logs) / n
+        slope = sum((d - mean_d) * y for d, y in enumerate(logs, 1)) / (n * (n * n - 1) / 12)
+        predicted = math.exp(mean_log + slope * (n + 1 - mean_d))
+        ratio = predicted / max(last_t, _MIN_PRED_NS)
+    elif n == 2:
+        raw_ratio = last_t / max(depth_times[0], _MIN_PRED_NS)
         # Never let prediction be too optimistic: enforce a baseline per phase
-        baseline = _phase_baseline_ratio(board)
-        ratio = max(baseline, raw_ratio)
+        ratio = max(_phase_baseline_ratio(phase), raw_ratio)
+    else:
+        # If only one depth, fall back to baseline
+        ratio = _phase_baseline_ratio(phase)
 
     ratio = min(ratio, MAX_RATIO_CAP)
-    return last_t * ratio * PRED_INFLATION
+    return int(last_t * ratio * PRED_INFLATION)
 
-def iterativeDeepen(board: chess.Board, table, allowed_moves: Optional[list] = None,
+def iterativeDeepen(board: chess.Board, table: Optional[TranspositionTable] = None,
+                   allowed_moves: Optional[list[chess.Move]] = None,
                    remaining_time: float = 60.0, increment: float = 0.0,
-                   max_depth: Optional[int] = None) -> chess.Move:
+                   max_depth: Optional[int] = None, ponder: bool = False) -> chess.Move:
     """
     Iterative deepening with strict pre-start gating for each next depth.
     We never start a depth unless we are confident it will finish within budget.
+    table is the eval cache (evaluate() falls back to its own when None); the search
+    table is shared across calls, see get_or_create_tt(). With ponder, a background
+    search on the predicted reply runs until the next call.
     """
-    start_time = time.time()
-    time_budget = calculate_time_allocation(remaining_time, increment, board)
+    start_ns = time.monotonic_ns()
+    # Convert to a SearchBoard once (pick_move would replay the move stack at every depth), and
+    # generate and filter the root moves once: every depth searches the same tuple
+    if not isinstance(board, SearchBoard):
+        board = SearchBoard.from_board(board)
+    root_moves = tuple(board.generate_legal_moves())
+    if allowed_moves:
+        allow_key = {(m.from_square, m.to_square, m.promotion) for m in allowed_moves}
+        root_moves = tuple(m for m in root_moves if (m.from_square, m.to_square, m.promotion) in allow_key)
+
+    if remaining_time < PANIC_MOVE_TIME:
+        _stop_ponder(board.zobrist)
+        logger.warning("PANIC MOVE: %.2fs remaining, not searching", remaining_time)
+        return best_capture(board, root_moves) if root_moves else chess.Move.null()
+
+    # Classify the position once; every phase-dependent choice below reuses it
+    phase = _board_phase(board)
+    time_budget = calculate_time_allocation(remaining_time, increment, board, phase=phase)
 
     # Panic mode
-    if remaining_time < PANIC_THRESHOLD:
-        print(f"PANIC MODE: {remaining_time:.2f}s remaining")
+    panic = remaining_time < PANIC_THRESHOLD
+    if panic:
+        logger.warning("PANIC MODE: %.2fs remaining", remaining_time)
         max_depth = PANIC_DEPTH
-        time_budget = min(time_budget, remaining_time * 0.3)
-
-    print(f"Time budget: {time_budget:.2f}s | Remaining: {remaining_time:.2f}s | Phase: {_get_phase_name(board)}")
-
-    completed_moves: dict[int, tuple[chess.Move, float]] = {}  # depth -> (move, time)
-    completed_times: dict[int, float] = {}
+        time_budget = min(time_budget, remaining_time * PANIC_TIME_FRACTION)
+
+    # Already repeated or at the 50-move limit: the game is drifting to a draw, so don't burn
+    # the full budget. The clock test is an int compare, so it goes before the repetition walk.
+    drawish = board.halfmove_clock >= 100 or board.is_repetition(2)
+    if drawish:
+        max_depth = min(max_depth or DRAWISH_DEPTH, DRAWISH_DEPTH)
+        time_budget = min(time_budget, DRAWISH_TIME)
+
+    logger.info("Time budget: %.2fs | Remaining: %.2fs | Phase: %s", time_budget, remaining_time, _get_phase_name(phase))
+
+    key = board.zobrist
+    ponder_move = _stop_ponder(key)
+    if ponder_move not in root_moves:
+        ponder_move = None
+    if board.fullmove_number <= BOOK_MAX_MOVE:
+        book_move = _book_move(board, root_moves, bool(allowed_moves))
+        if book_move is not None:
+            logger.info("Book move: %s", book_move)
+            if ponder:
+                _start_ponder(board, book_move, table)
+            return book_move
+
+    # Depths complete in order, so depth d's move and time sit at index d - 1
+    completed_moves: list[chess.Move] = []
+    depth_times: list[int] = []  # ns per completed depth, depth 1 first
     best_move = None
     prev_best_move = None
+    prev_score: Optional[int] = None
+    searches, re_searches = aspiration_stats["searches"], aspiration_stats["re_searches"]
+    # Search tables shared by every depth, so each pick_move call starts from the previous depth's.
+    # The search table also carries over from earlier moves, aged rather than cleared.
+    search_tt = get_or_create_tt()
+    search_tt.new_search()
+    search_tt, killers, history = new_search_tables(search_tt)
     pv_stability = 0
     depth = 1
 
     # Phase-based default max depth if not provided
-    piece_count = len(board.piece_map())
     if max_depth is None:
-        move_num = board.fullmove_number
-        if piece_count >= 28 and move_num <= 15:
-            max_depth = 8
-        elif piece_count >= 20:
-            max_depth = 12
-        elif piece_count >= 10:
-            max_depth = 16
-        else:
-            max_depth = 20
+        max_depth = PHASE_CONFIG[phase][0]
+
+    # Deadlines in integer nanoseconds
+    budget_ns = int(time_budget * _NS_PER_S)
+    usable_ns = int(time_budget * SAFETY_MARGIN * _NS_PER_S)
+    # A panic budget is below the minimum slack; the prediction checks still guard depth 2
+    min_slack_ns = 0 if panic else int(MIN_SLACK_TO_START * _NS_PER_S)
 
     while depth <= max_depth:
-        elapsed = time.time() - start_time
-        slack = time_budget * SAFETY_MARGIN - elapsed  # conservative usable time remaining
+        elapsed_ns = time.monotonic_ns() - start_ns
+        slack_ns = usable_ns - elapsed_ns  # conservative usable time remaining
 
         # Stop if we're already near/over budget
-        if slack <= 0:
-            print(f"Stopping: reached time budget ({elapsed:.2f}s >= {time_budget * SAFETY_MARGIN:.2f}s)")
+        if slack_ns <= 0:
+            logger.debug("Stopping: reached time budget (%.2fs >= %.2fs)", elapsed_ns / _NS_PER_S, usable_ns / _NS_PER_S)
             break
 
         # Require some minimum slack to even consider another depth
-        if slack < MIN_SLACK_TO_START:
-            print(f"Stopping: not enough slack to start depth {depth} (slack {slack:.2f}s < {MIN_SLACK_TO_START:.2f}s)")
+        if slack_ns < min_slack_ns:
+            logger.debug("Stopping: not enough slack to start depth %d (slack %.2fs < %.2fs)",
+                         depth, slack_ns / _NS_PER_S, MIN_SLACK_TO_START)
             break
 
         # Predict if the *next* depth is safe to start
-        if completed_times:
-            predicted_next = _predict_next_depth_time(completed_times, board)
+        if depth_times:
+            predicted_ns = _predict_next_depth_time(depth_times, phase)
             # Hard refusal based on last depth's time scaled
-            last_time = completed_times[max(completed_times.keys())]
-            if last_time * HARD_FACTOR > slack:
-                print(f"Stopping: hard guard (last {last_time:.2f}s * {HARD_FACTOR:.1f} > slack {slack:.2f}s)")
+            last_ns = depth_times[-1]
+            if last_ns * HARD_FACTOR > slack_ns:
+                logger.debug("Stopping: hard guard (last %.2fs * %.1f > slack %.2fs)",
+                             last_ns / _NS_PER_S, HARD_FACTOR, slack_ns / _NS_PER_S)
                 break
 
             # PV-stability heuristics (avoid spending ages to play the same move)
@@ -172,99 +337,103 @@ def iterativeDeepen(board: chess.Board, table, allowed_moves: Optional[list] = N
             else:
                 pv_stability = 0
 
-            total_if_next = (time.time() - start_time) + predicted_next
-            frac_of_budget = total_if_next / max(time_budget, 1e-3)
+            # Reuse the clock reading from the top of the loop
+            total_if_next = elapsed_ns + predicted_ns
+            frac_of_budget = total_if_next / max(budget_ns, _MIN_PRED_NS)
 
             # If PV stable 2+, be very strict
             if pv_stability >= 2 and frac_of_budget > PV_STABILITY_STRICT:
-                print(f"Stopping: PV stable (≥2) and next depth predicted to exceed {PV_STABILITY_STRICT*100:.0f}% of budget "
-                      f"({total_if_next:.2f}s > {time_budget*PV_STABILITY_STRICT:.2f}s)")
+                logger.debug("Stopping: PV stable (≥2) and next depth predicted to exceed %.0f%% of budget (%.2fs > %.2fs)",
+                             PV_STABILITY_STRICT * 100, total_if_next / _NS_PER_S, time_budget * PV_STABILITY_STRICT)
                 break
             # If PV stable 1, be somewhat strict
             if pv_stability == 1 and frac_of_budget > PV_STABILITY_LENIENT:
-                print(f"Stopping: PV stable and next depth predicted to exceed {PV_STABILITY_LENIENT*100:.0f}% of budget "
-                      f"({total_if_next:.2f}s > {time_budget*PV_STABILITY_LENIENT:.2f}s)")
+                logger.debug("Stopping: PV stable and next depth predicted to exceed %.0f%% of budget (%.2fs > %.2fs)",
+                             PV_STABILITY_LENIENT * 100, total_if_next / _NS_PER_S, time_budget * PV_STABILITY_LENIENT)
                 break
 
             # General conservative check
-            if total_if_next > time_budget:
-                print(f"Stopping: next depth predicted to exceed budget "
-                      f"({total_if_next:.2f}s > {time_budget:.2f}s) [pred {predicted_next:.2f}s]")
+            if total_if_next > budget_ns:
+                logger.debug("Stopping: next depth predicted to exceed budget (%.2fs > %.2fs) [pred %.2fs]",
+                             total_if_next / _NS_PER_S, time_budget, predicted_ns / _NS_PER_S)
                 break
 
         # Attempt search at this depth (blocking)
-        depth_start = time.time()
+        depth_start_ns = time.monotonic_ns()
         try:
-            # NOTE: alphabeta.pick_move signature is (board, depth, table, allowed_moves)
-            move = pick_move(board, depth, table, allowed_moves)
-            depth_time = time.time() - depth_start
+            # Split the root moves across processes, except at depth 1 (too cheap to pay for the
+            # round trip) and in panic mode. pick_move searches sequentially when it cannot start a pool.
+            workers = 1 if panic or depth == 1 else ROOT_WORKERS
+            # Shallow depths re-run pick_move's own deepening (cheap with the shared tables); deeper
+            # ones only search the new depth in an aspiration window around the previous score
+            window_score = prev_score if depth >= ASPIRATION_MIN_DEPTH else None
+            # The previous depth's best move is searched first at the root (the ponder move before depth 1)
+            first_move = best_move or ponder_move
+            move, score = pick_move_with_score(board, depth, table, allowed_moves, first_move, workers=workers,
+                                               prev_score=window_score, search_tt=search_tt,
+                                               killers=killers, history=history, root_moves=root_moves)
+            if score is not None:
+                prev_score = score
+            depth_ns = time.monotonic_ns() - depth_start_ns
 
             if move and move != chess.Move.null():
-                completed_moves[depth] = (move, depth_time)
-                completed_times[depth] = depth_time
+                completed_moves.append(move)
+                depth_times.append(depth_ns)
                 prev_best_move, best_move = best_move, move
-                print(f"Depth {depth}: {move} ({depth_time:.2f}s)")
+                logger.debug("Depth %d: %s (%.2fs)", depth, move, depth_ns / _NS_PER_S)
 
-                # --- NEW: early exit if depth 3 matches depth 1 or depth 2 ---
+                # Early exit if depth 3 matches depth 1 or depth 2
                 if depth == 3:
                     d3 = move
                     same_depth = None
-                    if 1 in completed_moves and completed_moves[1][0] == d3:
+                    if completed_moves[0] == d3:
                         same_depth = 1
-                    elif 2 in completed_moves and completed_moves[2][0] == d3:
+                    elif completed_moves[1] == d3:
                         same_depth = 2
                     if same_depth is not None:
-                        total_time = time.time() - start_time
-                        print(f"Early stop: depth 3 agrees with depth {same_depth}; playing depth 3 move.")
-                        print(f"Completed depths: {sorted(completed_moves.keys())}")
-                        print(f"Using depth 3 move: {d3}")
-                        print(f"Total time: {total_time:.2f}s / {time_budget:.2f}s ({total_time/time_budget*100:.0f}%)")
+                        total_time = (time.monotonic_ns() - start_ns) / _NS_PER_S
+                        logger.info("Early stop: depth 3 agrees with depth %d; playing depth 3 move %s "
+                                    "(%.2fs / %.2fs, %.0f%%)", same_depth, d3, total_time, time_budget,
+                                    total_time / time_budget * 100)
+                        if ponder:
+                            _start_ponder(board, d3, table)
                         return d3
-                # --- END NEW ---
 
             else:
-                print(f"Depth {depth}: returned null move, stopping")
+                logger.debug("Depth %d: returned null move, stopping", depth)
                 break
 
         except KeyboardInterrupt:
-            print(f"Interrupted at depth {depth}")
+            logger.warning("Interrupted at depth %d", depth)
             break
         except Exception as e:
-            print(f"Error at depth {depth}: {type(e).__name__}: {str(e)[:100]}")
-            if len(completed_moves) >= 1:
-                # Keep the last completed result
-                break
-            else:
-                print("ERROR: No completed searches, using fallback")
-                break
+            logger.error("Error at depth %d: %s: %s", depth, type(e).__name__, str(e)[:100])
+            # Keep the last completed result, if any
+            if not completed_moves:
+                logger.error("No completed searches, using fallback")
+            break
 
         depth += 1
 
-    total_time = time.time() - start_time
+    total_time = (time.monotonic_ns() - start_ns) / _NS_PER_S
+    searches = aspiration_stats["searches"] - searches
+    if searches:
+        logger.debug("Aspiration re-searches: %d/%d", aspiration_stats["re_searches"] - re_searches, searches)
 
     # Choose deepest completed move
     if completed_moves:
-        max_completed_depth = max(completed_moves.keys())
-        final_move = completed_moves[max_completed_depth][0]
-        done_depths = sorted(completed_moves.keys())
-        print(f"Completed depths: {done_depths}")
-        print(f"Using depth {max_completed_depth} move: {final_move}")
-        print(f"Total time: {total_time:.2f}s / {time_budget:.2f}s ({total_time/time_budget*100:.0f}%)")
+        last_completed_depth = len(completed_moves)
+        final_move = completed_moves[-1]
+        logger.info("Completed depths: 1-%d | Using depth %d move: %s | Total time: %.2fs / %.2fs (%.0f%%)",
+                    last_completed_depth, last_completed_depth, final_move, total_time, time_budget,
+                    total_time / time_budget * 100)
+        if ponder:
+            _start_ponder(board, final_move, table)
         return final_move
     else:
-        print("WARNING: No completed searches! Picking random legal move")
-        legal_moves = list(board.legal_moves) if allowed_moves is None else allowed_moves
-        return legal_moves[0] if legal_moves else chess.Move.null()
+        logger.warning("No completed searches! Picking best capture")
+        return best_capture(board, root_moves) if root_moves else chess.Move.null()
 
-def _get_phase_name(board: chess.Board) -> str:
+def _get_phase_name(phase: int) -> str:
     """Helper to identify game phase for logging"""
-    piece_count = len(board.piece_map())
-    move_num = board.fullmove_number
-    if piece_count >= 28 and move_num <= 15:
-        return "Opening"
-    elif piece_count >= 20:
-        return "Middlegame"
-    elif piece_count >= 10:
-        return "Early Endgame"
-    else:
-        return "Late Endgame"
+    return PHASE_CONFIG[phase][4]
@@ -0,0 +1,85 @@
+"""Tests for the incrementally updated search board and static exchange evaluation."""
+import random
+import chess
+import chess.polyglot
+from SearchBoard import SearchBoard, _piece_types, game_phase, material_score, pst_score
+from alphabeta import _see
+
+# Start positions with castling, en passant and promotions close at hand
+FENS = [chess.STARTING_FEN,
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"]
+
+
+def assert_in_sync(board: SearchBoard) -> None:
+    """Check every incrementally maintained field against a full recompute."""
+    assert board.zobrist == chess.polyglot.zobrist_hash(board)
+    assert board.piece_types == _piece_types(board)
+    assert board.psq == pst_score(board)
+    assert board.material == material_score(board)
+    assert board.phase == game_phase(board)
+
+
+def test_incremental_state_random_games() -> None:
+    """Test the incremental key, piece types and scores over random push/pop/copy/root sequences."""
+    rng = random.Random(2025)
+    for fen in FENS:
+        for _ in range(20):
+            board = SearchBoard(fen)
+            for _ in range(60):
+                moves = list(board.legal_moves)
+                if not moves or (board.move_stack and rng.random() < 0.2):
+                    if not board.move_stack:
+                        break
+                    board.pop()
+                else:
+                    board.push(rng.choice(moves))
+                assert_in_sync(board)
+                if rng.random() < 0.05:
+                    board = board.copy(stack=rng.choice((True, False, 5)))
+                    assert_in_sync(board)
+            assert_in_sync(board.root())
+
+
+def test_null_move() -> None:
+    """Test that a null move keeps the incremental state in sync."""
+    board = SearchBoard(FENS[1])
+    board.push(chess.Move.from_uci("e5d7"))
+    board.push(chess.Move.from_uci("c7c5"))
+    board.push(chess.Move.null())
+    assert_in_sync(board)
+    board.pop()
+    assert_in_sync(board)
+
+
+def test_repetition_random_games() -> None:
+    """Test is_repetition() and can_claim_threefold_repetition() against chess.Board."""
+    rng = random.Random(7)
+    shuffles = [chess.Move.from_uci(uci) for uci in ("g1f3", "b8c6", "f3g1", "c6b8")]
+    for _ in range(20):
+        search_board = SearchBoard()
+        board = chess.Board()
+        for ply in range(40):
+            moves = list(board.legal_moves)
+            # Mostly shuffle the knights so that positions repeat
+            move = shuffles[ply % 4] if rng.random() < 0.7 and shuffles[ply % 4] in moves else rng.choice(moves)
+            board.push(move)
+            search_board.push(move)
+            for count in (2, 3):
+                assert search_board.is_repetition(count) == board.is_repetition(count)
+            assert search_board.can_claim_threefold_repetition() == board.can_claim_threefold_repetition()
+            if board.is_game_over():
+                break
+
+
+def test_see() -> None:
+    """Test static exchange evaluation on a few known exchanges."""
+    cases = [("4k3/8/5p2/4n3/3P4/8/8/4K3 w - - 0 1", "d4e5", 220),  # pawn takes a knight defended by a pawn
+             ("4k3/8/5p2/4p3/8/8/8/4Q1K1 w - - 0 1", "e1e5", -800),  # queen takes a defended pawn
+             ("4k3/4r3/8/4p3/8/8/4R3/4R1K1 w - - 0 1", "e2e5", 100),  # x-ray rook backs up the capture
+             ("4k3/4r3/8/4p3/8/8/4R3/6K1 w - - 0 1", "e2e5", -400),  # lone rook takes a defended pawn
+             ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 100)]  # en passant
+    for fen, uci, expected in cases:
+        assert _see(SearchBoard(fen), chess.Move.from_uci(uci)) == expected